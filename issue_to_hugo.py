@@ -4,10 +4,28 @@ import re
 import requests
 import json
 import logging
-from urllib.parse import unquote
+import hashlib
+import shutil
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from urllib.parse import unquote, urlparse, parse_qs
 from datetime import datetime
-from github import Github, Auth
-from bs4 import BeautifulSoup
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # 可选依赖，C实现的JSON序列化
+except ImportError:
+    orjson = None
+
+try:
+    import re2  # 可选依赖，基于自动机的正则引擎（google-re2），保证线性时间
+except ImportError:
+    re2 = None
 
 # ======================
 # 用户可配置区域（修改这些常量以适应您的需求）
@@ -19,6 +37,98 @@ CATEGORY_MAP = ["生活", "技术", "学习", "思考", "项目"]
 # 触发发布的标签（可替换为其他标签名）
 PUBLISH_LABEL = "发布"
 
+# 分类集合（由 CATEGORY_MAP 生成，无需修改）
+CATEGORY_SET = frozenset(CATEGORY_MAP)
+
+# ======================
+# 预编译正则表达式
+# ======================
+
+# 超过该长度的文本使用 re2（若已安装）：短文本上标准库 re 更快，
+# re2 则保证长文本（尤其是病态输入）上的线性时间
+RE2_MIN_LENGTH = 100 * 1024
+
+def compile_re2(pattern, flags=0):
+    """使用 re2 预编译正则，未安装或不支持该语法时返回 None"""
+    if re2 is None:
+        return None
+    inline_flags = "".join(
+        char for flag, char in ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+        if flags & flag
+    )
+    try:
+        return re2.compile(f"(?{inline_flags}){pattern}" if inline_flags else pattern)
+    except re2.error:
+        return None
+
+class SizedRegex:
+    """同时预编译 re 与 re2 版本，按待匹配文本的长度选择引擎"""
+    
+    def __init__(self, pattern, flags=0):
+        self.re = re.compile(pattern, flags)
+        self.re2 = compile_re2(pattern, flags)
+    
+    def for_text(self, text):
+        """返回适合该文本长度的已编译正则"""
+        if self.re2 is not None and len(text) >= RE2_MIN_LENGTH:
+            return self.re2
+        return self.re
+
+_MD_IMG_PATTERN = r"!\[([^\]]*?)\]\((https?:\/\/[^\)]+)\)"
+_HTML_IMG_PATTERN = r'<img[^>]+src=["\']?(https?:\/\/[^"\'>]+)["\']?'
+
+# Markdown图片语法
+MD_IMG_RE = SizedRegex(_MD_IMG_PATTERN, re.IGNORECASE)
+# Markdown图片或HTML图片标签（单次扫描）
+IMG_RE = SizedRegex(f"{_MD_IMG_PATTERN}|{_HTML_IMG_PATTERN}", re.IGNORECASE)
+# HTML图片alt属性
+ALT_RE = re.compile(r'alt=["\']?([^"\'>]+)["\']?')
+_FENCE_PATTERN = r"^[^\S\n]*```(?:.*?^[^\S\n]*```[^\n]*\n?|.*)"
+
+# 多行代码块（```，未闭合时延续到末尾）
+FENCE_RE = SizedRegex(f"({_FENCE_PATTERN})", re.MULTILINE | re.DOTALL)
+# 代码区域：多行代码块或行内代码（`）
+CODE_RE = SizedRegex(f"{_FENCE_PATTERN}|`[^`\n]+`", re.MULTILINE | re.DOTALL)
+# $tag$ 格式标签
+TAG_RE = re.compile(r'\$(.+?)\$')
+# URL参数
+URL_PARAM_RE = re.compile(r"\?.*$")
+# 文件名非法字符
+UNSAFE_CHAR_RE = re.compile(r"[^a-zA-Z0-9\-_]")
+# 允许保留的HTML标签（其他标签会被移除）
+ALLOWED_TAGS = [
+    "p", "a", "code", "pre", "blockquote", 
+    "ul", "ol", "li", "strong", "em", 
+    "img", "h1", "h2", "h3", "h4", "h5", "h6"
+]
+# 非允许标签
+DISALLOWED_TAG_RE = re.compile(
+    r"</?(?!(?:%s)\b)[a-zA-Z][^<>]*>" % "|".join(ALLOWED_TAGS), re.IGNORECASE
+)
+
+# 网络I/O线程池（图片下载与API分页共用；网络I/O会释放GIL，多线程即可并发）
+_IO_POOL = ThreadPoolExecutor(max_workers=8)
+
+# 复用HTTP连接（keep-alive + 连接池），Session 可在线程间共享
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+# GitHub REST API
+GITHUB_API = "https://api.github.com"
+
+# 图片缓存（输出目录下的 .image_cache.json，记录 URL -> ETag/本地路径/SHA256）
+IMAGE_CACHE_FILE = ".image_cache.json"
+_IMAGE_CACHE = {}
+_IMAGE_CACHE_DIR = None
+_IMAGE_CACHE_DIRTY = False  # 本次运行是否有新增或变更的缓存条目
+_IMAGE_CACHE_LOCK = threading.Lock()
+
 # ======================
 # 核心功能函数
 # ======================
@@ -36,62 +146,64 @@ def setup_logger(debug=False):
     
     return logger
 
-def is_within_code_block(text, position):
+def split_code_segments(text):
     """
-    检查指定位置是否在代码块内
-    支持多行代码块（```）和内联代码（`）
+    按多行代码块切分正文
+    偶数下标为普通文本（可能含行内代码），奇数下标为代码块（''.join 后还原为原文）
     """
-    lines = text.split('\n')
-    in_code_block = False
-    in_inline_code = False
-    char_count = 0
-    
-    for line in lines:
-        line_start = char_count
-        line_end = char_count + len(line) + 1
-        
-        # 检查当前位置是否在当前行
-        if position >= line_start and position <= line_end:
-            if in_inline_code or in_code_block:
-                return True
-        
-        # 检测多行代码块
-        if line.strip().startswith('```'):
-            in_code_block = not in_code_block
-        
-        # 检测内联代码
-        inline_code_matches = list(re.finditer(r'`[^`]+`', line))
-        for match in inline_code_matches:
-            start, end = match.span()
-            if position >= line_start + start and position <= line_start + end:
-                return True
-        
-        char_count += len(line) + 1
+    if '```' not in text:
+        return [text]
+    return FENCE_RE.for_text(text).split(text)
+
+def build_code_spans(text):
+    """
+    定位代码区域
+    返回按位置排序的 (起始位置列表, 结束位置列表)，正文不含反引号时返回 None
+    """
+    if '`' not in text:
+        return None
     
-    return in_code_block
+    starts = []
+    ends = []
+    for match in CODE_RE.for_text(text).finditer(text):
+        starts.append(match.start())
+        ends.append(match.end())
+    return starts, ends
+
+def is_within_code_block(spans, position):
+    """检查指定位置是否在代码块内（spans 由 build_code_spans 生成）"""
+    if spans is None:
+        return False
+    starts, ends = spans
+    i = bisect_right(starts, position) - 1
+    return i >= 0 and position < ends[i]
 
 def extract_cover_image(body):
     """从正文提取首张非代码块图片作为封面图"""
-    img_pattern = r"!\[([^\]]*?)\]\((https?:\/\/[^\)]+)\)"
-    matches = list(re.finditer(img_pattern, body))
-    
-    for match in matches:
-        img_url = match.group(2)
-        start_pos = match.start()
-        if not is_within_code_block(body, start_pos):
-            # 移除封面图标记
-            body = body[:match.start()] + body[match.end():]
-            return img_url, body
+    if '![' not in body:
+        return None, body
+    
+    # 仅在代码块以外的文本段中查找，并跳过起始于行内代码的图片
+    md_img_re = MD_IMG_RE.for_text(body)
+    segments = split_code_segments(body)
+    for i in range(0, len(segments), 2):
+        spans = build_code_spans(segments[i])
+        for match in md_img_re.finditer(segments[i]):
+            if not is_within_code_block(spans, match.start()):
+                # 移除封面图标记
+                segments[i] = segments[i][:match.start()] + segments[i][match.end():]
+                return match.group(2), ''.join(segments)
     return None, body
 
+@lru_cache(maxsize=1024)
 def safe_filename(filename):
     """生成安全的文件名（保留合法字符和扩展名）"""
-    clean_url = re.sub(r"\?.*$", "", filename)  # 移除URL参数
+    clean_url = URL_PARAM_RE.sub("", filename)  # 移除URL参数
     basename = os.path.basename(clean_url)
     decoded_name = unquote(basename)  # URL解码
     
     name, ext = os.path.splitext(decoded_name)
-    safe_name = re.sub(r"[^a-zA-Z0-9\-_]", "_", name)  # 替换非法字符
+    safe_name = UNSAFE_CHAR_RE.sub("_", name)  # 替换非法字符
     
     # 验证图片扩展名
     valid_extensions = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
@@ -104,17 +216,94 @@ def safe_filename(filename):
     
     return safe_name + ext
 
-def download_image(url, output_path, token=None):
+def load_image_cache(output_dir):
+    """读取输出目录下的图片缓存"""
+    global _IMAGE_CACHE_DIR, _IMAGE_CACHE_DIRTY
+    _IMAGE_CACHE_DIR = Path(output_dir)
+    _IMAGE_CACHE_DIRTY = False
+    _IMAGE_CACHE.clear()
+    try:
+        with open(_IMAGE_CACHE_DIR / IMAGE_CACHE_FILE, encoding="utf-8") as f:
+            _IMAGE_CACHE.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"图片缓存读取失败，将重新下载: {e}")
+
+def save_image_cache():
+    """
+    原子写入图片缓存（先写临时文件再替换）
+    缓存未变化时不写入，避免输出目录出现无意义的变更
+    """
+    global _IMAGE_CACHE_DIRTY
+    if _IMAGE_CACHE_DIR is None:
+        return
+    cache_file = _IMAGE_CACHE_DIR / IMAGE_CACHE_FILE
+    tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+    with _IMAGE_CACHE_LOCK:
+        if not _IMAGE_CACHE_DIRTY:
+            return
+        data = json.dumps(_IMAGE_CACHE, ensure_ascii=False, indent=2, sort_keys=True)
+        _IMAGE_CACHE_DIRTY = False
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp_file, cache_file)
+
+def file_sha256(path):
+    """计算文件的SHA256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def get_cached_image(url):
+    """
+    查找URL对应的已缓存图片
+    返回 (etag, 本地路径)，文件缺失或内容被修改时返回 None
+    """
+    if _IMAGE_CACHE_DIR is None:
+        return None
+    with _IMAGE_CACHE_LOCK:
+        entry = _IMAGE_CACHE.get(url)
+    if not entry or not entry.get("etag"):
+        return None
+    cached_path = _IMAGE_CACHE_DIR / entry["path"]
+    try:
+        if file_sha256(cached_path) != entry["sha256"]:
+            return None
+    except OSError:
+        return None
+    return entry["etag"], cached_path
+
+def link_or_copy(src, dst):
+    """优先使用硬链接复用文件，跨设备等情况下退回复制"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def download_image(url, output_path):
     """
     下载图片到本地
     基于内容类型自动确定文件扩展名
+    已缓存的图片使用 If-None-Match 条件请求，未变化时直接复用本地文件
     """
+    global _IMAGE_CACHE_DIRTY
     try:
-        headers = {}
-        if token:
-            headers['Authorization'] = f'token {token}'
-        
-        response = requests.get(url, stream=True, headers=headers)
+        cached = get_cached_image(url)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        response = _SESSION.get(url, stream=True, timeout=(5, 30), headers=headers)
+        if response.status_code == 304 and cached:
+            response.content  # 读完响应体，连接才会归还连接池
+            cached_path = cached[1]
+            output_path = Path(output_path)
+            if output_path.suffix.lower() not in [".jpg", ".jpeg", ".png", ".gif", ".webp"]:
+                output_path = output_path.with_suffix(cached_path.suffix)
+            if output_path.resolve() != cached_path.resolve():
+                link_or_copy(cached_path, output_path)
+            logging.info(f"图片未变化，复用缓存: {url} -> {output_path}")
+            return output_path
         if response.status_code == 200:
             # 根据Content-Type确定文件类型
             content_type = response.headers.get("content-type", "").lower()
@@ -129,83 +318,137 @@ def download_image(url, output_path, token=None):
                 ext = ".webp"
             
             # 处理输出路径
-            base, current_ext = os.path.splitext(output_path)
-            if current_ext.lower() not in [".jpg", ".jpeg", ".png", ".gif", ".webp"]:
-                output_path = base + ext
+            output_path = Path(output_path)
+            if output_path.suffix.lower() not in [".jpg", ".jpeg", ".png", ".gif", ".webp"]:
+                output_path = output_path.with_suffix(ext)
             
             # 保存图片
+            digest = hashlib.sha256()
             with open(output_path, 'wb') as f:
-                f.write(response.content)
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
+                    digest.update(chunk)
+            
+            # 记录缓存
+            etag = response.headers.get("etag")
+            if etag and _IMAGE_CACHE_DIR is not None:
+                entry = {
+                    "etag": etag,
+                    "path": os.path.relpath(output_path, _IMAGE_CACHE_DIR),
+                    "sha256": digest.hexdigest()
+                }
+                with _IMAGE_CACHE_LOCK:
+                    if _IMAGE_CACHE.get(url) != entry:
+                        _IMAGE_CACHE[url] = entry
+                        _IMAGE_CACHE_DIRTY = True
             logging.info(f"下载成功: {url} -> {output_path}")
             return output_path
         else:
+            response.content  # 读完响应体，连接才会归还连接池
             logging.error(f"下载失败，状态码: {response.status_code}, URL: {url}")
     except Exception as e:
         logging.error(f"下载图片失败: {url} - {e}")
     return None
 
-def replace_image_urls(body, issue_number, output_dir, token=None):
+def download_images(urls, issue_number, output_dir):
     """
-    替换正文中的图片URL为本地路径
-    跳过代码块内的图片
+    并发下载多张图片
+    返回 {图片URL: 本地文件名}，下载失败的图片不包含在内
     """
-    # Markdown图片语法
-    md_img_pattern = r"!\[([^\]]*?)\]\((https?:\/\/[^\)]+)\)"
-    # HTML图片标签
-    html_img_pattern = r'<img[^>]+src=["\']?(https?:\/\/[^"\'>]+)["\']?'
-    
-    def md_replacer(match):
-        """Markdown图片替换处理函数"""
-        if is_within_code_block(body, match.start()):
-            return match.group(0)  # 跳过代码块内的图片
-        alt_text = match.group(1)
-        img_url = match.group(2)
+    futures = {}
+    used_names = set()
+    for img_url in dict.fromkeys(urls):  # 去重并保持顺序
         filename = f"{issue_number}_{safe_filename(img_url)}"
-        output_path = os.path.join(output_dir, filename)
-        final_path = download_image(img_url, output_path, token)
+        # 不同URL可能生成相同文件名（扩展名可能按Content-Type补全，故按主文件名判断），
+        # 冲突时追加URL哈希，避免并发写入同一文件
+        stem, ext = os.path.splitext(filename)
+        if stem.lower() in used_names:
+            stem = f"{stem}_{hashlib.sha1(img_url.encode('utf-8')).hexdigest()[:8]}"
+            filename = stem + ext
+        used_names.add(stem.lower())
+        output_path = output_dir / filename
+        future = _IO_POOL.submit(download_image, img_url, output_path)
+        futures[future] = img_url
+    
+    local_names = {}
+    for future in as_completed(futures):
+        final_path = future.result()
         if final_path:
-            final_filename = os.path.basename(final_path)
-            return f"![{alt_text}]({final_filename})"
-        return match.group(0)
+            local_names[futures[future]] = final_path.name
+    return local_names
+
+def replace_image_urls(body, issue_number, output_dir):
+    """
+    替换正文中的图片URL为本地路径
+    跳过代码块内的图片
+    """
+    if '![' not in body and '<' not in body:
+        return body
+    
+    def image_url(match):
+        """取出匹配到的图片URL（Markdown语法为第2组，HTML标签为第3组）"""
+        return match.group(2) or match.group(3)
     
-    def html_replacer(match):
-        """HTML图片替换处理函数"""
-        if is_within_code_block(body, match.start()):
+    def replacer(match, spans):
+        """图片替换处理函数"""
+        if is_within_code_block(spans, match.start()):
+            return match.group(0)  # 跳过行内代码中的图片
+        final_filename = local_names.get(image_url(match))
+        if not final_filename:
             return match.group(0)
-        img_url = match.group(1)
-        alt_match = re.search(r'alt=["\']?([^"\'>]+)["\']?', match.group(0))
-        alt_text = alt_match.group(1) if alt_match else 'Image'
-        filename = f"{issue_number}_{safe_filename(img_url)}"
-        output_path = os.path.join(output_dir, filename)
-        final_path = download_image(img_url, output_path, token)
-        if final_path:
-            final_filename = os.path.basename(final_path)
-            return f"![{alt_text}]({final_filename})"
-        return match.group(0)
+        if match.group(2):
+            alt_text = match.group(1)
+        else:
+            alt_match = ALT_RE.search(match.group(0))
+            alt_text = alt_match.group(1) if alt_match else 'Image'
+        return f"![{alt_text}]({final_filename})"
     
-    # 执行替换
-    body = re.sub(md_img_pattern, md_replacer, body, flags=re.IGNORECASE)
-    body = re.sub(html_img_pattern, html_replacer, body, flags=re.IGNORECASE)
-    return body
+    # 仅处理代码块以外的文本段（偶数下标），代码块原样保留
+    img_re = IMG_RE.for_text(body)
+    segments = split_code_segments(body)
+    text_segments = segments[::2]
+    segment_spans = [build_code_spans(segment) for segment in text_segments]
+    
+    # 收集图片URL并并发下载
+    img_urls = [
+        image_url(match)
+        for segment, spans in zip(text_segments, segment_spans)
+        for match in img_re.finditer(segment)
+        if not is_within_code_block(spans, match.start())
+    ]
+    local_names = download_images(img_urls, issue_number, output_dir)
+    
+    # 执行替换（单次扫描同时处理两种语法）
+    segments[::2] = [
+        img_re.sub(lambda match: replacer(match, spans), segment)
+        for segment, spans in zip(text_segments, segment_spans)
+    ]
+    return ''.join(segments)
 
 def sanitize_markdown(content):
-    """清理Markdown中不安全的HTML标签"""
+    """
+    清理Markdown中不安全的HTML标签
+    嵌套构造的标签（如 <scr<script>ipt>）在移除内层后会重新拼出新标签，
+    因此重复移除直到结果不再变化
+
+    >>> sanitize_markdown('<scr<script>ipt>alert(1)</scr</script>ipt>')
+    'alert(1)'
+    >>> sanitize_markdown('<<script>script>alert(1)<</script>/script>')
+    'alert(1)'
+    >>> sanitize_markdown('<p><div>保留</div></p>')
+    '<p>保留</p>'
+    """
     if not content:
         return ""
+    if '<' not in content:
+        return content
     
-    # 仅允许安全的HTML标签
-    soup = BeautifulSoup(content, "html.parser")
-    allowed_tags = [
-        "p", "a", "code", "pre", "blockquote", 
-        "ul", "ol", "li", "strong", "em", 
-        "img", "h1", "h2", "h3", "h4", "h5", "h6"
-    ]
-    
-    for tag in soup.find_all(True):
-        if tag.name not in allowed_tags:
-            tag.unwrap()  # 移除非允许标签但保留内容
-    
-    return str(soup)
+    # 仅允许安全的HTML标签，移除其他标签但保留内容
+    while True:
+        cleaned = DISALLOWED_TAG_RE.sub("", content)
+        if cleaned == content:
+            return cleaned
+        content = cleaned
 
 def extract_tags_from_body(body, logger):
     """从正文最后一行提取标签（跳过代码块）"""
@@ -213,6 +456,9 @@ def extract_tags_from_body(body, logger):
         return [], body
     
     body = body.replace('\r\n', '\n').rstrip()
+    if '$' not in body:
+        return [], body
+    
     lines = body.split('\n')
     if not lines:
         return [], body
@@ -221,12 +467,12 @@ def extract_tags_from_body(body, logger):
     char_position = len(body) - len(last_line)
     
     # 检查是否在代码块中
-    if is_within_code_block(body, char_position):
+    if is_within_code_block(build_code_spans(body), char_position):
         logger.debug("最后一行在代码块内，跳过标签提取")
         return [], body
     
     # 使用 $tag$ 格式提取标签
-    tags = re.findall(r'\$(.+?)\$', last_line, re.UNICODE)
+    tags = TAG_RE.findall(last_line)
     tags = [tag.strip() for tag in tags if tag.strip()]
     
     if tags:
@@ -236,59 +482,140 @@ def extract_tags_from_body(body, logger):
     
     return tags, body
 
-def convert_issue(issue, output_dir, token, logger):
+@dataclass
+class Issue:
+    """convert_issue 所需的Issue字段"""
+    number: int
+    title: str
+    body: str
+    state: str
+    created_at: datetime
+    labels: list = field(default_factory=list)
+    pull_request: bool = False
+
+def github_api(method, path, **kwargs):
+    """调用GitHub REST API（复用下载用的Session与认证头）"""
+    response = _SESSION.request(
+        method, f"{GITHUB_API}{path}",
+        headers={"Accept": "application/vnd.github+json"},
+        timeout=(5, 30), **kwargs
+    )
+    response.raise_for_status()
+    return response
+
+def parse_issue(data):
+    """将API返回的JSON转换为 Issue"""
+    return Issue(
+        number=data["number"],
+        title=data["title"],
+        body=data.get("body") or "",
+        state=data["state"],
+        created_at=datetime.strptime(data["created_at"], "%Y-%m-%dT%H:%M:%SZ"),
+        labels=[label["name"] for label in data.get("labels", [])],
+        pull_request="pull_request" in data
+    )
+
+def fetch_open_issues(repo):
+    """
+    获取所有打开的Issues（每页100条）
+    首页返回后根据Link头得知总页数，其余页面并发获取
+    """
+    def fetch_page(page):
+        params = {"state": "open", "per_page": 100, "page": page}
+        return github_api("GET", f"/repos/{repo}/issues", params=params)
+    
+    first = fetch_page(1)
+    pages = [first.json()]
+    last_url = first.links.get("last", {}).get("url")
+    if last_url:
+        last_page = int(parse_qs(urlparse(last_url).query)["page"][0])
+        futures = [_IO_POOL.submit(fetch_page, page) for page in range(2, last_page + 1)]
+        pages += [future.result().json() for future in futures]
+    return [parse_issue(data) for page in pages for data in page]
+
+def report_conversion_error(repo, issue, error):
+    """在Issue中添加错误评论并打上错误标签"""
+    error_comment = f"⚠️ 转换失败，请检查格式:\n\n```\n{error}\n```"
+    if len(error_comment) > 65536:
+        error_comment = error_comment[:65000] + "\n```\n...(内容过长)"
+    
+    github_api("POST", f"/repos/{repo}/issues/{issue.number}/comments", json={"body": error_comment})
+    
+    # 添加错误标签
+    try:
+        github_api("GET", f"/repos/{repo}/labels/conversion-error")
+    except requests.HTTPError:
+        github_api("POST", f"/repos/{repo}/labels", json={"name": "conversion-error", "color": "ff0000"})
+    github_api("POST", f"/repos/{repo}/issues/{issue.number}/labels", json={"labels": ["conversion-error"]})
+
+def dumps_tags(tags):
+    """将标签列表序列化为JSON（优先使用orjson）"""
+    if orjson is not None:
+        return orjson.dumps(tags).decode("utf-8")
+    return json.dumps(tags, ensure_ascii=False)
+
+def convert_issue(issue, output_dir, logger):
     """转换单个issue为Hugo内容"""
     try:
-        labels = [label.name for label in issue.labels]
+        labels = issue.labels
+        label_set = set(labels)
         
         # 检查是否带发布标签
-        if PUBLISH_LABEL not in labels or issue.state != "open":
+        if PUBLISH_LABEL not in label_set or issue.state != "open":
             logger.debug(f"跳过 issue #{issue.number} - 未标记为发布")
             return False
         
         # 创建内容目录
-        pub_date = issue.created_at.strftime("%Y%m%d")
+        iso_date = issue.created_at.strftime("%Y-%m-%d")
+        pub_date = iso_date.replace("-", "")
         slug = f"{pub_date}_{issue.number}"  # 唯一标识符
-        post_dir = os.path.join(output_dir, slug)
+        post_dir = Path(output_dir) / slug
         
-        if os.path.exists(post_dir):
+        try:
+            post_dir.mkdir(parents=True)
+        except FileExistsError:
             logger.info(f"跳过 issue #{issue.number} - 内容已存在")
             return False
         
-        os.makedirs(post_dir, exist_ok=True)
-        
         # 处理正文内容
         body = issue.body or ""
         cover_url, body = extract_cover_image(body)  # 提取封面图
+        
+        # 封面图与正文图片并行下载
+        cover_future = None
+        if cover_url:
+            cover_filename = f"cover_{safe_filename(cover_url)}"
+            cover_path = post_dir / cover_filename
+            cover_future = _IO_POOL.submit(download_image, cover_url, cover_path)
+        
         tags, body = extract_tags_from_body(body, logger)  # 提取标签
         body = sanitize_markdown(body)  # 清理HTML
-        body = replace_image_urls(body, issue.number, post_dir, token)  # 处理图片
+        body = replace_image_urls(body, issue.number, post_dir)  # 处理图片
         
         # 确定分类（取第一个匹配的标签）
-        categories = [tag for tag in labels if tag in CATEGORY_MAP]
-        category = categories[0] if categories else "未分类"
+        category = next((tag for tag in labels if tag in CATEGORY_SET), "未分类")
         
-        # 下载封面图
+        # 等待封面图下载完成
         cover_name = None
-        if cover_url:
+        if cover_future:
             try:
-                cover_filename = f"cover_{safe_filename(cover_url)}"
-                cover_path = os.path.join(post_dir, cover_filename)
-                final_cover_path = download_image(cover_url, cover_path, token)
+                final_cover_path = cover_future.result()
                 if final_cover_path:
-                    cover_name = os.path.basename(final_cover_path)
+                    cover_name = final_cover_path.name
                     logger.info(f"封面图已下载: {cover_url}")
             except Exception as e:
                 logger.error(f"封面图下载失败: {cover_url} - {e}")
         
-        # 生成Front Matter
+        # 生成Front Matter（转义双引号）
+        title = issue.title.replace('"', '\\"')
+        category = category.replace('"', '\\"')
         frontmatter_lines = [
             "---",
-            f'title: "{issue.title.replace(\'"\', \'\\\\"\')}"',  # 转义双引号
-            f'date: "{issue.created_at.strftime("%Y-%m-%d")}"',
+            f'title: "{title}"',
+            f'date: "{iso_date}"',
             f'slug: "{slug}"',
-            f'categories: ["{category.replace(\'"\', \'\\\\"\')}"]',
-            f'tags: {json.dumps(tags, ensure_ascii=False)}'
+            f'categories: ["{category}"]',
+            f'tags: {dumps_tags(tags)}'
         ]
         
         if cover_name:
@@ -297,10 +624,11 @@ def convert_issue(issue, output_dir, token, logger):
         frontmatter_lines.append("---\n")
         frontmatter = "\n".join(frontmatter_lines)
         
-        # 写入Markdown文件
-        md_file = os.path.join(post_dir, "index.md")
+        # 写入Markdown文件（分两次写入，避免拼接出正文的完整副本）
+        md_file = post_dir / "index.md"
         with open(md_file, "w", encoding="utf-8") as f:
-            f.write(frontmatter + body)
+            f.write(frontmatter)
+            f.write(body)
         
         logger.info(f"转换完成: issue #{issue.number} -> {md_file}")
         return True
@@ -322,11 +650,12 @@ def main():
         logger.error("缺少GitHub Token")
         return
     
+    # API请求与图片下载共用的认证头（每次运行设置一次）
+    _SESSION.headers.update({'Authorization': f'token {token}'})
+    
     try:
         # 连接GitHub API
-        auth = Auth.Token(token)
-        g = Github(auth=auth)
-        repo = g.get_repo(args.repo)
+        github_api("GET", f"/repos/{args.repo}")
         logger.info(f"已连接仓库: {args.repo}")
     except Exception as e:
         logger.error(f"连接GitHub失败: {str(e)}")
@@ -334,6 +663,7 @@ def main():
     
     # 准备输出目录
     os.makedirs(args.output, exist_ok=True)
+    load_image_cache(args.output)
     logger.info(f"输出目录: {os.path.abspath(args.output)}")
     
     processed_count = 0
@@ -341,37 +671,31 @@ def main():
     
     try:
         # 处理所有打开的Issues
-        issues = repo.get_issues(state="open")
-        total_issues = issues.totalCount
-        logger.info(f"开始处理 {total_issues} 个 Issues")
+        issues = fetch_open_issues(args.repo)
+        logger.info(f"开始处理 {len(issues)} 个 Issues")
         
         for issue in issues:
             if issue.pull_request:  # 跳过PR
                 continue
             try:
-                if convert_issue(issue, args.output, token, logger):
+                if convert_issue(issue, args.output, logger):
                     processed_count += 1
             except Exception as e:
                 error_count += 1
                 logger.error(f"处理失败 issue #{issue.number}: {str(e)}")
                 try:
                     # 在Issue中添加错误信息
-                    error_comment = f"⚠️ 转换失败，请检查格式:\n\n```\n{str(e)}\n```"
-                    if len(error_comment) > 65536:
-                        error_comment = error_comment[:65000] + "\n```\n...(内容过长)"
-                    
-                    issue.create_comment(error_comment)
-                    
-                    # 添加错误标签
-                    try:
-                        error_label = repo.get_label("conversion-error")
-                    except:
-                        error_label = repo.create_label("conversion-error", "ff0000")
-                    issue.add_to_labels(error_label)
+                    report_conversion_error(args.repo, issue, e)
                 except Exception as inner_e:
                     logger.error(f"添加评论失败: {inner_e}")
     except Exception as e:
         logger.exception(f"获取Issues失败: {e}")
+    
+    # 保存图片缓存
+    try:
+        save_image_cache()
+    except Exception as e:
+        logger.error(f"图片缓存保存失败: {e}")
         
     # 输出统计信息
     summary = f"处理完成! 成功: {processed_count}, 失败: {error_count}"